@@ -1,15 +1,25 @@
 """Automated API test runner and result saver."""
 
-import json
 import argparse
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from lib.types import TestDefinition, TestSuite, AuthState
-from lib.http_client import check_health
+from lib.jsonutil import json_loads
+from lib.http_client import check_health, close_session, enable_http2
 from lib.auth import perform_login
 from lib.test_runner import run_test_suite
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Caches shared across test files within one run: the same server is not
+# health-checked twice, and a login is performed once per credential set.
+_health_cache: Dict[str, Tuple[bool, Optional[str]]] = {}
+_login_cache: Dict[Tuple[str, str, str], AuthState] = {}
+
 
 def parse_args() -> argparse.Namespace:
     """Parse command-line arguments for output directory and test files."""
@@ -29,6 +39,11 @@ def parse_args() -> argparse.Namespace:
         default='./tests',
         help='Directory containing test JSON files (default: ./tests)'
     )
+    parser.add_argument(
+        '--http2',
+        action='store_true',
+        help='Use an HTTP/2 multiplexed client (requires httpx[http2])'
+    )
     return parser.parse_args()
 
 
@@ -37,32 +52,71 @@ def setup_outdir(outdir: str) -> None:
     os.makedirs(outdir, exist_ok=True)
 
 
+def _make_test_definition(t: dict) -> TestDefinition:
+    """Convert a raw test dictionary into a TestDefinition."""
+    return TestDefinition(
+        name=t.get("name", ""),
+        cmd=t.get("cmd", "GET"),
+        endpoint=t.get("endpoint", "/"),
+        headers=t.get("headers"),
+        data=t.get("data"),
+        details=t.get("details"),
+        notes=t.get("notes")
+    )
+
+
+def _stream_parse_suite(f) -> Tuple[dict, List[TestDefinition]]:
+    """
+    Parse a test file incrementally with ijson.
+
+    Top-level scalar fields are collected as they stream past, and each
+    entry of the tests array is converted to a TestDefinition as soon as
+    it completes, so the raw document is never materialized in full.
+    Floats are requested as native float (ijson defaults to Decimal,
+    which is not JSON-serializable when test data is sent back out).
+
+    Args:
+        f: Binary file object positioned at the start of the JSON
+
+    Returns:
+        Tuple of (top-level scalar fields, test definitions)
+    """
+    fields: dict = {}
+    tests: List[TestDefinition] = []
+    builder = None
+
+    for prefix, event, value in ijson.parse(f, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == 'tests.item' and event == 'end_map':
+                tests.append(_make_test_definition(builder.value))
+                builder = None
+        elif prefix == 'tests.item' and event == 'start_map':
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix and '.' not in prefix and event in ('string', 'number', 'boolean'):
+            fields[prefix] = value
+
+    return fields, tests
+
+
 def load_test_suite(test_file: str) -> TestSuite:
     """Load test suite from JSON file."""
-    with open(test_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    # Convert test dictionaries to TestDefinition objects
-    tests = [
-        TestDefinition(
-            name=t.get("name", ""),
-            cmd=t.get("cmd", "GET"),
-            endpoint=t.get("endpoint", "/"),
-            headers=t.get("headers"),
-            data=t.get("data"),
-            details=t.get("details"),
-            notes=t.get("notes")
-        )
-        for t in data.get("tests", [])
-    ]
-    
+    with open(test_file, 'rb') as f:
+        if ijson is not None:
+            fields, tests = _stream_parse_suite(f)
+        else:
+            data = json_loads(f.read())
+            fields = data
+            tests = [_make_test_definition(t) for t in data.get("tests", [])]
+
     return TestSuite(
-        docURL=data["docURL"],
-        serverURL=data["serverURL"],
-        prefix=data.get("prefix", ""),
-        username=data.get("username", "admin"),
-        password=data.get("password", "moonadmin12#"),
-        health=data.get("health", "/health"),
+        docURL=fields["docURL"],
+        serverURL=fields["serverURL"],
+        prefix=fields.get("prefix", ""),
+        username=fields.get("username", "admin"),
+        password=fields.get("password", "moonadmin12#"),
+        health=fields.get("health", "/health"),
         tests=tests
     )
 
@@ -81,37 +135,80 @@ def get_test_files(args: argparse.Namespace) -> List[str]:
     """Get list of test files to process."""
     if args.input:
         return [args.input]
-    
-    # Find all .json files in testdir
-    return [
-        os.path.join(args.testdir, f)
-        for f in os.listdir(args.testdir)
-        if f.endswith('.json')
-    ]
+
+    # Find all .json files in testdir; scandir carries cached file-type
+    # info from the directory read, avoiding a stat per entry
+    with os.scandir(args.testdir) as entries:
+        test_files = [
+            entry.path
+            for entry in entries
+            if entry.is_file() and entry.name.endswith('.json')
+        ]
+
+    # Sort once here for deterministic execution order
+    return sorted(test_files)
+
+
+def check_health_cached(health_url: str) -> Tuple[bool, Optional[str]]:
+    """Check server health, reusing the result for repeated URLs."""
+    if health_url not in _health_cache:
+        _health_cache[health_url] = check_health(health_url)
+    return _health_cache[health_url]
+
+
+def perform_login_cached(
+    server_url: str,
+    username: str,
+    password: str
+) -> Optional[AuthState]:
+    """
+    Login once per (server, credentials) and reuse the tokens afterwards.
+
+    Each caller gets a fresh AuthState seeded from the cached tokens, so
+    token updates during one test suite do not leak into the next file.
+    Only successful logins are cached; a failure (e.g. a transient
+    server hiccup) is retried on the next file instead of being pinned.
+    """
+    key = (server_url, username, password)
+    cached = _login_cache.get(key)
+    if cached is None:
+        cached = perform_login(server_url, username, password)
+        if not cached or not cached.access_token:
+            return None
+        _login_cache[key] = cached
+
+    auth_state = AuthState(
+        current_username=username,
+        current_password=password
+    )
+    auth_state.update_access_token(cached.access_token)
+    if cached.refresh_token:
+        auth_state.update_refresh_token(cached.refresh_token)
+    return auth_state
 
 
 def process_test_file(test_file: str, args: argparse.Namespace) -> None:
     """Process a single test file."""
     # Load test suite
     test_suite = load_test_suite(test_file)
-    
-    # Perform health check
+
+    # Perform health check (cached per URL across files)
     health_url = f"{test_suite.serverURL}{test_suite.prefix}{test_suite.health}"
-    is_healthy, error_msg = check_health(health_url)
-    
+    is_healthy, error_msg = check_health_cached(health_url)
+
     if not is_healthy:
         print(f"Skipping {test_file} [server unhealthy: {error_msg}]")
         return
-    
+
     # Check if authentication is needed
     auth_state: Optional[AuthState] = None
     if check_if_auth_needed(test_suite):
-        auth_state = perform_login(
+        auth_state = perform_login_cached(
             test_suite.serverURL,
             test_suite.username,
             test_suite.password
         )
-        if not auth_state or not auth_state.access_token:
+        if not auth_state:
             print(f"Login failed for {test_file}")
             return
     
@@ -126,21 +223,30 @@ def process_test_file(test_file: str, args: argparse.Namespace) -> None:
     print("\n==============================================")
     print(f"Executed {test_file} [{result.status}]")
     print("==============================================\n")
-    print(result.markdown)
+    if result.markdown:
+        print(result.markdown)
+    else:
+        print(f"Results written to {result.output_file}")
 
 
 def main() -> None:
     """Entry point: parse arguments, ensure output directory, and run all tests."""
     args = parse_args()
     setup_outdir(args.outdir)
-    
+
+    if args.http2 and not enable_http2():
+        print("httpx with HTTP/2 support is not installed; using requests")
+
     test_files = get_test_files(args)
-    
-    for test_file in test_files:
-        try:
-            process_test_file(test_file, args)
-        except Exception as e:
-            print(f"Error processing {test_file}: {e}")
+
+    try:
+        for test_file in test_files:
+            try:
+                process_test_file(test_file, args)
+            except Exception as e:
+                print(f"Error processing {test_file}: {e}")
+    finally:
+        close_session()
 
 
 if __name__ == "__main__":
@@ -8,7 +8,7 @@ from .types import (
     PlaceholderContext,
     TestResult
 )
-from .http_client import execute_request, check_health
+from .http_client import execute_request, check_health, get_session, close_session
 from .auth import perform_login
 from .test_runner import run_test_suite
 from .formatters import format_markdown_result, sanitize_curl_for_documentation
@@ -22,6 +22,8 @@ __all__ = [
     "TestResult",
     "execute_request",
     "check_health",
+    "get_session",
+    "close_session",
     "perform_login",
     "run_test_suite",
     "format_markdown_result",
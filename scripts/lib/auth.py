@@ -1,10 +1,10 @@
 """Authentication and token management for API testing."""
 
-import requests
-import json
 from typing import Optional, Dict, Any
 
 from .types import AuthState, TestDefinition
+from .http_client import get_session
+from .jsonutil import json_loads
 
 
 def perform_login(
@@ -32,14 +32,14 @@ def perform_login(
     }
     
     try:
-        resp = requests.post(
+        resp = get_session().post(
             login_url,
             json=login_data,
             headers={"Content-Type": "application/json"},
             timeout=timeout
         )
         resp.raise_for_status()
-        token_json = resp.json()
+        token_json = json_loads(resp.content)
         
         auth_state = AuthState(
             current_username=username,
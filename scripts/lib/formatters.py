@@ -1,10 +1,29 @@
 """Output formatting utilities for API test results."""
 
-from typing import Optional, List
+import re
+from functools import lru_cache
+from typing import Optional, List, Tuple
 
 from .types import AuthState
 
 
+@lru_cache(maxsize=128)
+def _compile_redaction_pattern(keys: Tuple[str, ...]) -> "re.Pattern[str]":
+    """
+    Compile an alternation pattern matching any of the given literals.
+
+    Cached so the pattern is rebuilt only when the token set changes,
+    not once per test.
+
+    Args:
+        keys: Literal strings to match, longest first
+
+    Returns:
+        Compiled pattern matching any key
+    """
+    return re.compile("|".join(re.escape(key) for key in keys))
+
+
 def format_markdown_result(
     curl_cmd: str,
     status: str,
@@ -12,10 +31,10 @@ def format_markdown_result(
     test_name: Optional[str] = None,
     details: Optional[str] = None,
     notes: Optional[str] = None
-) -> List[str]:
+) -> str:
     """
-    Format a single API test result as Markdown lines.
-    
+    Format a single API test result as a Markdown block.
+
     Args:
         curl_cmd: Formatted curl command
         status: HTTP response status
@@ -23,26 +42,26 @@ def format_markdown_result(
         test_name: Optional test name for heading
         details: Optional details to include before curl command
         notes: Optional notes to include after response
-        
+
     Returns:
-        List of markdown lines
+        Markdown block for the test result
     """
     lines = []
-    
+
     if test_name:
         lines.append(f"### {test_name}\n")
-    
+
     if details:
         lines.append(f"{details}\n")
-    
+
     if notes:
         lines.append(f"{notes}\n")
-    
+
     lines.append(f"```bash\n{curl_cmd}\n```")
     lines.append(f"\n**Response ({status}):**\n")
     lines.append(f"```json\n{body}\n```\n")
-    
-    return lines
+
+    return "\n".join(lines)
 
 
 def sanitize_curl_for_documentation(
@@ -67,24 +86,48 @@ def sanitize_curl_for_documentation(
     Returns:
         Sanitized curl command suitable for documentation
     """
-    sanitized = curl_cmd
-    
-    # Replace server URL with doc URL
-    sanitized = sanitized.replace(server_url, doc_url)
-    
-    # Replace all access tokens with placeholder
+    # Build the replacement map: server URL plus every live token.
+    # A single compiled alternation scans the command once instead of one
+    # full str.replace pass per accumulated token.
+    replacements = {server_url: doc_url}
     for token in auth_state.all_access_tokens:
         if token:
-            sanitized = sanitized.replace(token, "$ACCESS_TOKEN")
-    
-    # Replace all refresh tokens with placeholder
+            replacements[token] = "$ACCESS_TOKEN"
     for token in auth_state.all_refresh_tokens:
         if token:
-            sanitized = sanitized.replace(token, "$REFRESH_TOKEN")
-    
+            replacements[token] = "$REFRESH_TOKEN"
+
     # Keep actual record IDs in the output (don't replace with placeholders)
-    
-    return sanitized
+
+    # Longest-first so a key that prefixes another cannot shadow it
+    keys = tuple(sorted(replacements, key=len, reverse=True))
+    pattern = _compile_redaction_pattern(keys)
+    return pattern.sub(lambda m: replacements[m.group(0)], curl_cmd)
+
+
+class MarkdownStreamWriter:
+    """
+    Streams markdown blocks to a file as they are produced.
+
+    Writing each test's block immediately keeps peak memory flat instead
+    of holding the whole suite's output (list plus joined string) before
+    a single final write.
+    """
+
+    def __init__(self, output_file: str):
+        self._file = open(output_file, 'w', encoding='utf-8', buffering=1 << 20)
+        self._first = True
+
+    def write_block(self, block: str) -> None:
+        """Write one markdown block, separated from the previous one."""
+        if not self._first:
+            self._file.write("\n")
+        self._file.write(block)
+        self._first = False
+
+    def close(self) -> None:
+        """Flush and close the underlying file."""
+        self._file.close()
 
 
 def write_markdown_output(
@@ -1,10 +1,105 @@
 """HTTP client for executing API requests."""
 
+import atexit
+import os
+import textwrap
+from functools import lru_cache
+
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Optional, Any, Tuple
 
 from .types import TestDefinition, TestResponse
+from .jsonutil import json_loads, json_dumps, json_dumps_pretty
+
+# ETag cache for conditional GETs, persisted across runs so repeated
+# invocations (e.g. per-PR CI) can skip unchanged response bodies
+_ETAG_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "api-check", "etags.json"
+)
+_etag_cache: Optional[Dict[str, Any]] = None
+_etag_cache_dirty = False
+
+
+def _create_session() -> requests.Session:
+    """
+    Create a shared session with connection pooling for both schemes.
+
+    Reusing one session gives HTTP keep-alive connection reuse, so only
+    the first request to a host pays the TCP + TLS handshake cost. The
+    pool is sized above the worker count of concurrent test batches, and
+    transient gateway errors are retried with a short backoff instead of
+    failing the whole test file.
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    retry = Retry(
+        total=2,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(["GET", "POST", "PUT", "DELETE", "PATCH"])
+    )
+    adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=retry
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+# Shared session used by all HTTP calls in the framework
+SESSION = _create_session()
+
+
+def get_session() -> Any:
+    """
+    Return the shared client used for all API requests.
+
+    Either a requests.Session or, after enable_http2(), an httpx.Client;
+    both expose the request/get/post surface the framework uses.
+    """
+    return SESSION
+
+
+def close_session() -> None:
+    """Close the shared client and release pooled connections."""
+    SESSION.close()
+
+
+def enable_http2(max_connections: int = 10) -> bool:
+    """
+    Switch the shared transport to an HTTP/2-multiplexed httpx client.
+
+    With HTTP/2 many in-flight requests share one stream-multiplexed
+    TCP+TLS connection, so concurrent batches pay no additional
+    handshakes. Requires the optional httpx package with its http2
+    extra; when unavailable the requests session stays in place.
+
+    Args:
+        max_connections: Connection limit for the httpx pool
+
+    Returns:
+        True if the HTTP/2 client was installed, False otherwise
+    """
+    global SESSION
+    try:
+        import httpx
+        client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=max_connections)
+        )
+    except ImportError:
+        return False
+
+    SESSION.close()
+    SESSION = client
+    return True
 
 
 def execute_request(
@@ -43,29 +138,104 @@ def execute_request(
     # Build curl command for documentation
     curl_cmd = _build_curl_command(url, method, headers, data)
     
-    # Execute request
+    # Execute request; pretty-printing the body is deferred to the
+    # TestResponse.body property so unnamed tests never pay for it
     response_obj: Optional[Dict[str, Any]] = None
+    raw_body: Optional[str] = None
     try:
-        resp = requests.request(method, url, **req_kwargs)
-        status = f"{resp.status_code} {resp.reason}"
+        resp = get_session().request(method, url, **req_kwargs)
+        # requests exposes .reason, httpx .reason_phrase
+        reason = getattr(resp, "reason", None) or getattr(resp, "reason_phrase", "")
+        status = f"{resp.status_code} {reason}"
         try:
-            body = resp.json()
-            response_obj = body
-            body_str = json.dumps(body, indent=2)
+            response_obj = json_loads(resp.content)
         except Exception:
-            body_str = resp.text
+            raw_body = resp.text
     except Exception as e:
         status = "ERROR"
-        body_str = str(e)
-    
+        raw_body = str(e)
+
     return TestResponse(
         curl_command=curl_cmd,
         status=status,
-        body=body_str,
-        response_obj=response_obj
+        response_obj=response_obj,
+        raw_body=raw_body
     )
 
 
+def _load_etag_cache() -> Dict[str, Any]:
+    """Load the persisted ETag cache on first use."""
+    global _etag_cache
+    if _etag_cache is None:
+        try:
+            with open(_ETAG_CACHE_PATH, 'rb') as f:
+                _etag_cache = json_loads(f.read())
+        except Exception:
+            _etag_cache = {}
+    return _etag_cache
+
+
+def _save_etag_cache() -> None:
+    """Persist the ETag cache if it changed during this run."""
+    if not _etag_cache_dirty or _etag_cache is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(_ETAG_CACHE_PATH), exist_ok=True)
+        with open(_ETAG_CACHE_PATH, 'w', encoding='utf-8') as f:
+            f.write(json_dumps(_etag_cache))
+    except Exception:
+        pass
+
+
+atexit.register(_save_etag_cache)
+
+
+def get_json_with_etag(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: int = 10
+) -> Optional[Any]:
+    """
+    GET a JSON resource with ETag revalidation.
+
+    When a cached ETag exists for the URL an If-None-Match header is
+    sent, so an unchanged resource answers 304 with no body and the
+    cached parsed JSON is returned without re-transfer or re-parse.
+
+    Args:
+        url: Resource URL
+        headers: Request headers (may contain auth token)
+        timeout: Request timeout in seconds
+
+    Returns:
+        Parsed JSON body, or None on error / non-200 without cache
+    """
+    global _etag_cache_dirty
+    cache = _load_etag_cache()
+    cached = cache.get(url)
+
+    request_headers = dict(headers) if headers else {}
+    if cached:
+        request_headers["If-None-Match"] = cached[0]
+
+    resp = get_session().get(url, headers=request_headers, timeout=timeout)
+
+    if resp.status_code == 304 and cached:
+        return cached[1]
+    if resp.status_code != 200:
+        return None
+
+    data = json_loads(resp.content)
+    etag = resp.headers.get("ETag")
+    if etag:
+        cache[url] = [etag, data]
+        _etag_cache_dirty = True
+    elif url in cache:
+        del cache[url]
+        _etag_cache_dirty = True
+    return data
+
+
 def check_health(url: str, timeout: int = 5) -> Tuple[bool, Optional[str]]:
     """
     Check if the API server is healthy.
@@ -78,7 +248,7 @@ def check_health(url: str, timeout: int = 5) -> Tuple[bool, Optional[str]]:
         Tuple of (is_healthy, error_message)
     """
     try:
-        resp = requests.get(url, timeout=timeout)
+        resp = get_session().get(url, timeout=timeout)
         if resp.status_code == 200:
             return True, None
         return False, f"Status {resp.status_code}"
@@ -94,36 +264,67 @@ def _build_curl_command(
 ) -> str:
     """
     Build a formatted curl command with proper line continuations and indentation.
-    
+
+    The inputs are reduced to hashable keys and the formatting is
+    memoized, so request shapes repeated across test files (common for
+    smoke and auth flows) skip the pretty-print and assembly work.
+
     Args:
         url: Full request URL
         method: HTTP method
         headers: Request headers
         data: Request body data
-        
+
+    Returns:
+        Formatted curl command string
+    """
+    headers_key = tuple(headers.items()) if headers else ()
+    if isinstance(data, (dict, list)):
+        # Compact serialization preserves key order, so equal-looking
+        # bodies with different ordering do not share a cache entry
+        data_key = json_dumps(data)
+        data_is_json = True
+    else:
+        data_key = data
+        data_is_json = False
+    return _build_curl_cached(url, method, headers_key, data_key, data_is_json)
+
+
+@lru_cache(maxsize=512)
+def _build_curl_cached(
+    url: str,
+    method: str,
+    headers_key: Tuple[Tuple[str, str], ...],
+    data_key: Optional[Any],
+    data_is_json: bool
+) -> str:
+    """
+    Memoized body of _build_curl_command over hashable inputs.
+
+    Args:
+        url: Full request URL
+        method: HTTP method
+        headers_key: Header items in declaration order
+        data_key: Compact JSON text for dict/list bodies, raw value otherwise
+        data_is_json: True when data_key holds serialized JSON
+
     Returns:
         Formatted curl command string
     """
     curl_lines = [f'curl -s -X {method} "{url}"']
-    
-    if headers:
-        for k, v in headers.items():
-            curl_lines.append(f'    -H "{k}: {v}"')
-    
-    if data is not None:
-        if isinstance(data, (dict, list)):
+
+    for k, v in headers_key:
+        curl_lines.append(f'    -H "{k}: {v}"')
+
+    if data_key is not None:
+        if data_is_json:
             # Format JSON with proper indentation (4 spaces base, 2 spaces for structure)
-            pretty_data = json.dumps(data, indent=2)
+            pretty_data = json_dumps_pretty(json_loads(data_key))
             # Indent each line of the JSON by 6 spaces (4 base + 2 for -d flag alignment)
-            indented_lines = ['      ' + line for line in pretty_data.split('\n')]
-            indented_data = '\n'.join(indented_lines)
+            indented_data = textwrap.indent(pretty_data, '      ')
             curl_lines.append(f"    -d '\n{indented_data}\n    '")
         else:
-            curl_lines.append(f"    -d '{data}'")
-    
-    # Add trailing backslash for all but last line
-    for i in range(len(curl_lines) - 1):
-        curl_lines[i] += ' \\'
-    
-    curl_cmd = "\n".join(curl_lines) + " | jq ."
-    return curl_cmd
+            curl_lines.append(f"    -d '{data_key}'")
+
+    # One join adds the line continuations without rebuilding each line
+    return " \\\n".join(curl_lines) + " | jq ."
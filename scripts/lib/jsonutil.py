@@ -0,0 +1,41 @@
+"""JSON helpers backed by orjson when available, stdlib json otherwise."""
+
+from typing import Any, Union
+
+try:
+    import orjson
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        """Parse JSON from a str or bytes payload."""
+        return orjson.loads(data)
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize an object to compact JSON text."""
+        return orjson.dumps(obj).decode()
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        """Serialize an object to compact JSON bytes."""
+        return orjson.dumps(obj)
+
+    def json_dumps_pretty(obj: Any) -> str:
+        """Serialize an object to 2-space indented JSON text."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+except ImportError:
+    import json
+
+    def json_loads(data: Union[str, bytes]) -> Any:
+        """Parse JSON from a str or bytes payload."""
+        return json.loads(data)
+
+    def json_dumps(obj: Any) -> str:
+        """Serialize an object to compact JSON text."""
+        return json.dumps(obj)
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        """Serialize an object to compact JSON bytes."""
+        return json.dumps(obj).encode()
+
+    def json_dumps_pretty(obj: Any) -> str:
+        """Serialize an object to 2-space indented JSON text."""
+        return json.dumps(obj, indent=2)
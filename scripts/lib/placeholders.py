@@ -1,11 +1,107 @@
 """Placeholder replacement utilities for API testing."""
 
-import json
 import re
-import requests
 from typing import Optional, Dict, Any, List
 
 from .types import TestDefinition, PlaceholderContext, AuthState
+from .http_client import get_json_with_etag
+
+# Matches every supported placeholder in one pass; the lookahead keeps
+# bare $ULID from swallowing the prefix of numbered $ULID1, $ULID2, ...
+_PLACEHOLDER_RE = re.compile(r"\$(?:ULID(?!\d)|NEXT_CURSOR|ACCESS_TOKEN|REFRESH_TOKEN)")
+
+# Numbered record-ID placeholders ($ULID1, $ULID2, ...)
+_NUMBERED_ULID_RE = re.compile(r"\$ULID(\d+)")
+
+# First path segment ending in ':' names the collection (/products:list)
+_COLLECTION_RE = re.compile(r"([^/?:]+):")
+
+# Probe order for single record-ID extraction
+_ARRAY_KEYS = ("apikeys", "users", "data", "records", "items")
+_ALT_ID_KEYS = ("_id", "ulid", "uuid")
+
+
+def _substitute_in_string(
+    text: str,
+    values: Dict[str, str],
+    used: set
+) -> str:
+    """
+    Replace all known placeholders in a string with one regex pass.
+
+    Args:
+        text: String possibly containing placeholders
+        values: Placeholder name -> replacement value
+        used: Set updated with the placeholders actually replaced
+
+    Returns:
+        String with placeholders replaced
+    """
+    def _sub(match: "re.Match[str]") -> str:
+        name = match.group(0)
+        value = values.get(name)
+        if value is None:
+            return name
+        used.add(name)
+        return value
+
+    return _PLACEHOLDER_RE.sub(_sub, text)
+
+
+def _walk_strings(obj: Any, transform) -> None:
+    """
+    Apply a transform to every string leaf of a nested structure in-place.
+
+    Walking the dict/list tree directly avoids the json.dumps/json.loads
+    round-trip previously used to substitute placeholders in request data.
+
+    Args:
+        obj: Dict or list to modify in-place (nested arbitrarily)
+        transform: Callable mapping a string leaf to its replacement
+    """
+    if isinstance(obj, dict):
+        for key, item in obj.items():
+            if isinstance(item, str):
+                obj[key] = transform(item)
+            elif isinstance(item, (dict, list)):
+                _walk_strings(item, transform)
+    elif isinstance(obj, list):
+        for index, item in enumerate(obj):
+            if isinstance(item, str):
+                obj[index] = transform(item)
+            elif isinstance(item, (dict, list)):
+                _walk_strings(item, transform)
+
+
+def _substitute_placeholders(obj: Any, values: Dict[str, str], used: set) -> None:
+    """
+    Substitute placeholders in all string leaves of a nested structure in-place.
+
+    Args:
+        obj: Dict or list to modify in-place (nested arbitrarily)
+        values: Placeholder name -> replacement value
+        used: Set updated with the placeholders actually replaced
+    """
+    _walk_strings(obj, lambda s: _substitute_in_string(s, values, used))
+
+
+def _substitute_in_data(
+    test: TestDefinition,
+    values: Dict[str, str],
+    used: set
+) -> None:
+    """
+    Substitute placeholders in a test's data, handling string and container bodies.
+
+    Args:
+        test: Test definition whose data is modified in-place
+        values: Placeholder name -> replacement value
+        used: Set updated with the placeholders actually replaced
+    """
+    if isinstance(test.data, str):
+        test.data = _substitute_in_string(test.data, values, used)
+    else:
+        _substitute_placeholders(test.data, values, used)
 
 
 def replace_auth_placeholders(
@@ -14,24 +110,29 @@ def replace_auth_placeholders(
 ) -> None:
     """
     Replace $ACCESS_TOKEN and $REFRESH_TOKEN placeholders in test definition.
-    
+
     Args:
         test: Test definition to modify in-place
         auth_state: Current authentication state
     """
+    used: set = set()
+
     # Replace $ACCESS_TOKEN in headers
     if auth_state.access_token and test.headers:
         if "Authorization" in test.headers:
-            test.headers["Authorization"] = test.headers["Authorization"].replace(
-                "$ACCESS_TOKEN", auth_state.access_token
+            test.headers["Authorization"] = _substitute_in_string(
+                test.headers["Authorization"],
+                {"$ACCESS_TOKEN": auth_state.access_token},
+                used
             )
-    
+
     # Replace $REFRESH_TOKEN in data
     if auth_state.refresh_token and test.data:
-        data_str = json.dumps(test.data)
-        if "$REFRESH_TOKEN" in data_str:
-            data_str = data_str.replace("$REFRESH_TOKEN", auth_state.refresh_token)
-            test.data = json.loads(data_str)
+        _substitute_in_data(
+            test,
+            {"$REFRESH_TOKEN": auth_state.refresh_token},
+            used
+        )
 
 
 def replace_record_placeholders(
@@ -49,77 +150,76 @@ def replace_record_placeholders(
         The placeholder type that was used ('$ULID', '$NEXT_CURSOR', or None)
     """
     placeholder_used = None
-    
-    # Handle numbered ULID placeholders (e.g., $ULID1, $ULID2)
+
+    # Handle numbered ULID placeholders (e.g., $ULID1, $ULID2) in-place
     if context.captured_record_ids:
+        record_ids = context.captured_record_ids
+        numbered_used: set = set()
+
+        def _sub_numbered(text: str) -> str:
+            return _replace_numbered_in_string(text, record_ids, numbered_used)
+
         # Replace in endpoint
         if test.endpoint:
-            test.endpoint = _replace_numbered_placeholders(
-                test.endpoint, context.captured_record_ids
-            )
-        
+            test.endpoint = _sub_numbered(test.endpoint)
+
         # Replace in data
         if test.data:
-            data_str = json.dumps(test.data)
-            data_str = _replace_numbered_placeholders(
-                data_str, context.captured_record_ids
-            )
-            test.data = json.loads(data_str)
-            if "$ULID" in json.dumps(context.captured_record_ids):
+            if isinstance(test.data, str):
+                test.data = _sub_numbered(test.data)
+            else:
+                _walk_strings(test.data, _sub_numbered)
+            if "$ULID" in numbered_used:
                 placeholder_used = "$ULID"
-    
+
     # Handle single record ID placeholders
     if not context.captured_record_id:
         return placeholder_used
     
     record_id = context.captured_record_id
-    
+    values = {"$ULID": record_id, "$NEXT_CURSOR": record_id}
+    used: set = set()
+
     # Replace in endpoint
     if test.endpoint:
-        if "$NEXT_CURSOR" in test.endpoint:
-            test.endpoint = test.endpoint.replace("$NEXT_CURSOR", record_id)
-            placeholder_used = "$NEXT_CURSOR"
-        elif "$ULID" in test.endpoint:
-            test.endpoint = test.endpoint.replace("$ULID", record_id)
-            placeholder_used = "$ULID"
-    
-    # Replace in data (recursive)
+        test.endpoint = _substitute_in_string(test.endpoint, values, used)
+
+    # Replace in data (recursive, in-place)
     if test.data:
-        data_str = json.dumps(test.data)
-        if "$NEXT_CURSOR" in data_str:
-            data_str = data_str.replace("$NEXT_CURSOR", record_id)
-            placeholder_used = "$NEXT_CURSOR"
-        elif "$ULID" in data_str:
-            data_str = data_str.replace("$ULID", record_id)
-            placeholder_used = "$ULID"
-        test.data = json.loads(data_str)
-    
+        _substitute_in_data(test, values, used)
+
+    if "$NEXT_CURSOR" in used:
+        placeholder_used = "$NEXT_CURSOR"
+    elif "$ULID" in used:
+        placeholder_used = "$ULID"
+
     return placeholder_used
 
 
-def _replace_numbered_placeholders(text: str, record_ids: List[str]) -> str:
+def _replace_numbered_in_string(
+    text: str,
+    record_ids: List[str],
+    used: set
+) -> str:
     """
-    Replace numbered placeholders like $ULID1, $ULID2 with actual record IDs.
-    
+    Replace numbered placeholders like $ULID1, $ULID2 with one regex pass.
+
     Args:
         text: Text containing placeholders
-        record_ids: List of record IDs to use for replacement
-        
+        record_ids: Record IDs indexed by placeholder number (1-based)
+        used: Set updated with '$ULID' when a replacement was made
+
     Returns:
-        Text with placeholders replaced
+        Text with numbered placeholders replaced
     """
-    # Find all numbered ULID placeholders
-    pattern = r'\$ULID(\d+)'
-    matches = re.findall(pattern, text)
-    
-    # Replace each numbered placeholder with corresponding record ID
-    for match in matches:
-        index = int(match) - 1  # Convert to 0-based index
+    def _sub(match: "re.Match[str]") -> str:
+        index = int(match.group(1)) - 1
         if 0 <= index < len(record_ids):
-            placeholder = f"$ULID{match}"
-            text = text.replace(placeholder, record_ids[index])
-    
-    return text
+            used.add("$ULID")
+            return record_ids[index]
+        return match.group(0)
+
+    return _NUMBERED_ULID_RE.sub(_sub, text)
 
 
 def extract_record_id_from_response(
@@ -137,43 +237,45 @@ def extract_record_id_from_response(
     """
     if not response_obj or not isinstance(response_obj, dict):
         return None
-    
+
     # Try direct id field
     if "id" in response_obj:
         return response_obj["id"]
-    
-    # Try data.id
-    if "data" in response_obj and isinstance(response_obj["data"], dict):
-        if "id" in response_obj["data"]:
-            return response_obj["data"]["id"]
-    
-    # Try record.id
-    if "record" in response_obj and isinstance(response_obj["record"], dict):
-        if "id" in response_obj["record"]:
-            return response_obj["record"]["id"]
-    
+
+    # Fetch nested containers once instead of re-probing them per key
+    data = response_obj.get("data")
+    if not isinstance(data, dict):
+        data = None
+    record = response_obj.get("record")
+    if not isinstance(record, dict):
+        record = None
+
+    # Try data.id, then record.id
+    if data is not None and "id" in data:
+        return data["id"]
+    if record is not None and "id" in record:
+        return record["id"]
+
     # Try arrays in common field names
-    for array_key in ["apikeys", "users", "data", "records", "items"]:
-        if array_key in response_obj:
-            items = response_obj[array_key]
-            if isinstance(items, list) and len(items) > 0:
-                # For users array, select second record if available, otherwise first
-                if array_key == "users" and len(items) > 1:
-                    selected_item = items[1]
-                else:
-                    selected_item = items[0]
-                
-                if isinstance(selected_item, dict) and "id" in selected_item:
-                    return selected_item["id"]
-    
+    for array_key in _ARRAY_KEYS:
+        items = response_obj.get(array_key)
+        if isinstance(items, list) and len(items) > 0:
+            # For users array, select second record if available, otherwise first
+            if array_key == "users" and len(items) > 1:
+                selected_item = items[1]
+            else:
+                selected_item = items[0]
+
+            if isinstance(selected_item, dict) and "id" in selected_item:
+                return selected_item["id"]
+
     # Try other common ID field names
-    for key in ["_id", "ulid", "uuid"]:
+    for key in _ALT_ID_KEYS:
         if key in response_obj:
             return response_obj[key]
-        if "data" in response_obj and isinstance(response_obj["data"], dict):
-            if key in response_obj["data"]:
-                return response_obj["data"][key]
-    
+        if data is not None and key in data:
+            return data[key]
+
     return None
 
 
@@ -238,10 +340,9 @@ def fetch_record_id_from_collection(
     try:
         list_endpoint = f"/{collection_name}:list"
         url = f"{base_url}{prefix}{list_endpoint}"
-        resp = requests.get(url, headers=headers, timeout=timeout)
-        
-        if resp.status_code == 200:
-            data = resp.json()
+        data = get_json_with_etag(url, headers=headers, timeout=timeout)
+
+        if data is not None:
             # Try to find records in common response structures
             for array_key in ["data", "records", "items", "apikeys", "users"]:
                 records = data.get(array_key, [])
@@ -268,10 +369,7 @@ def extract_collection_name(endpoint: str) -> Optional[str]:
     Returns:
         Collection name or None
     """
-    if '/' in endpoint:
-        endpoint = endpoint.split('?')[0]  # Remove query params
-        parts = endpoint.split('/')
-        for part in parts:
-            if ':' in part:
-                return part.split(':')[0]
-    return None
+    if not endpoint:
+        return None
+    match = _COLLECTION_RE.search(endpoint.partition('?')[0])
+    return match.group(1) if match else None
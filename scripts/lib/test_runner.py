@@ -1,16 +1,20 @@
 """Test execution orchestration for API testing framework."""
 
 import re
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from .jsonutil import json_dumps_bytes
 
 from .types import (
     TestDefinition,
     TestSuite,
+    TestResponse,
     TestResult,
     AuthState,
     PlaceholderContext
 )
-from .http_client import execute_request
+from .http_client import execute_request, get_json_with_etag
 from .auth import (
     detect_password_change,
     detect_token_refresh,
@@ -23,14 +27,70 @@ from .placeholders import (
     replace_auth_placeholders,
     replace_record_placeholders,
     extract_record_id_from_response,
-    extract_record_ids_from_response
+    extract_record_ids_from_response,
+    extract_collection_name
 )
 from .formatters import (
     format_markdown_result,
     sanitize_curl_for_documentation,
-    write_markdown_output
+    MarkdownStreamWriter
 )
 
+# Worker count for concurrent batches, sized to the shared session's pool
+_MAX_WORKERS = 10
+
+# Placeholder bitmask flags, computed once per test by _scan_placeholders
+_PH_ULID = 1
+_PH_NEXT_CURSOR = 2
+_PH_ACCESS_TOKEN = 4
+_PH_REFRESH_TOKEN = 8
+_PH_NUMBERED_ULID = 16
+
+_SINGLE_ULID_RE = re.compile(rb'\$ULID(?!\d)')
+_NUMBERED_ULID_RE = re.compile(rb'\$ULID\d')
+
+
+def _scan_placeholders(test: TestDefinition) -> int:
+    """
+    Compute which placeholders a test contains with one serialization pass.
+
+    The test is serialized once to bytes so the searches run through
+    bytes.find (C-level memmem) instead of Python-level str scans; the
+    steady-state loop then consults the resulting bitmask instead of
+    re-serializing the test per placeholder.
+
+    Args:
+        test: Test definition
+
+    Returns:
+        Bitwise OR of the _PH_* flags present in the test
+    """
+    parts = [(test.endpoint or "").encode()]
+    if test.headers:
+        parts.extend(
+            v.encode() for v in test.headers.values() if isinstance(v, str)
+        )
+    if test.data is not None:
+        parts.append(
+            test.data.encode() if isinstance(test.data, str)
+            else json_dumps_bytes(test.data)
+        )
+    blob = b"\n".join(parts)
+
+    mask = 0
+    if blob.find(b"$ULID") != -1:
+        if _SINGLE_ULID_RE.search(blob):
+            mask |= _PH_ULID
+        if _NUMBERED_ULID_RE.search(blob):
+            mask |= _PH_NUMBERED_ULID
+    if blob.find(b"$NEXT_CURSOR") != -1:
+        mask |= _PH_NEXT_CURSOR
+    if blob.find(b"$ACCESS_TOKEN") != -1:
+        mask |= _PH_ACCESS_TOKEN
+    if blob.find(b"$REFRESH_TOKEN") != -1:
+        mask |= _PH_REFRESH_TOKEN
+    return mask
+
 
 def run_test_suite(
     test_suite: TestSuite,
@@ -39,136 +99,86 @@ def run_test_suite(
 ) -> TestResult:
     """
     Execute all tests in a test suite and generate markdown output.
-    
+
+    When output_file is given, markdown blocks are streamed straight to
+    the file as tests complete and the returned TestResult carries an
+    empty markdown string; the in-memory copy is built only for callers
+    that did not ask for a file.
+
     Args:
         test_suite: Test suite definition
         auth_state: Initial authentication state (can be None)
         output_file: Path to write markdown output
-        
+
     Returns:
         TestResult with execution status and output
     """
     markdown_lines: List[str] = []
     all_tests_passed = True
     placeholder_context = PlaceholderContext()
-    
+
+    # Stream to the output file as blocks are produced instead of holding
+    # the whole suite's markdown in memory until the end
+    writer = MarkdownStreamWriter(output_file) if output_file else None
+
     # Initialize auth state if not provided
     if auth_state is None:
         auth_state = AuthState()
-    
-    for test in test_suite.tests:
-        # Make a copy to avoid modifying the original
-        test_copy = _copy_test(test)
-        
-        # Replace authentication placeholders first (needed for API calls)
-        replace_auth_placeholders(test_copy, auth_state)
-        
-        # Check if this test needs fresh numbered placeholders
-        if _test_needs_numbered_placeholders(test_copy):
-            # Extract collection name from the test endpoint
-            collection_name = _extract_collection_name_from_test(test_copy)
-            if collection_name:
-                # Fetch fresh IDs from the collection (headers now have real tokens)
-                fresh_ids = _fetch_fresh_record_ids(
+
+    # Scan each test once for the placeholders it contains; the execution
+    # loop consults these masks instead of re-searching per test
+    masks = [_scan_placeholders(test) for test in test_suite.tests]
+
+    # One executor serves every multi-test batch in the suite; created
+    # lazily so suites with no batchable runs never spawn threads
+    executor: Optional[ThreadPoolExecutor] = None
+
+    try:
+        for batch in _partition_into_batches(test_suite.tests, masks):
+            # Prepare copies with placeholders resolved at dispatch time
+            prepared = [
+                _prepare_test(test, mask, test_suite, auth_state, placeholder_context)
+                for test, mask in batch
+            ]
+
+            # Independent tests in a batch share no state, so their requests
+            # can be dispatched concurrently over the pooled session; barrier
+            # tests always form single-test batches and run inline.
+            if len(prepared) == 1:
+                responses = [execute_request(
                     test_suite.serverURL,
                     test_suite.prefix,
-                    collection_name,
-                    test_copy.headers
-                )
-                if fresh_ids:
-                    # Create a temporary context with fresh IDs
-                    temp_context = PlaceholderContext()
-                    temp_context.set_record_ids(fresh_ids)
-                    replace_record_placeholders(test_copy, temp_context)
-        
-        # Replace single record placeholders if we have a captured ID
-        elif placeholder_context.captured_record_id:
-            placeholder_type = replace_record_placeholders(test_copy, placeholder_context)
-            if placeholder_type:
-                placeholder_context.placeholder_type = placeholder_type
-        
-        # Detect password change before execution
-        new_password = detect_password_change(test_copy)
-        
-        # Execute the test
-        response = execute_request(
-            test_suite.serverURL,
-            test_suite.prefix,
-            test_copy
-        )
-        
-        # Check for token refresh or login and update tokens
-        is_successful = response.status.startswith("2")
-        if is_successful and response.response_obj:
-            is_login = detect_login(test_copy)
-            is_refresh = detect_token_refresh(test_copy)
-            
-            if is_login or is_refresh:
-                access_token, refresh_token = extract_tokens_from_response(
-                    response.response_obj
-                )
-                if access_token:
-                    auth_state.update_access_token(access_token)
-                if refresh_token:
-                    auth_state.update_refresh_token(refresh_token)
-        
-        # Handle password change: re-login with new password
-        if should_relogin_after_test(test_copy, response.status, new_password):
-            if new_password and auth_state.current_username:
-                new_auth_state = relogin_with_new_password(
-                    test_suite.serverURL,
-                    auth_state.current_username,
-                    new_password
-                )
-                if new_auth_state:
-                    # Update credentials and tokens
-                    auth_state.update_credentials(
-                        auth_state.current_username,
-                        new_password
-                    )
-                    if new_auth_state.access_token:
-                        auth_state.update_access_token(new_auth_state.access_token)
-                    if new_auth_state.refresh_token:
-                        auth_state.update_refresh_token(new_auth_state.refresh_token)
-        
-        # Try to capture single record ID from successful create/list responses
-        if is_successful and response.response_obj:
-            endpoint = test_copy.endpoint
-            if ":create" in endpoint or ":list" in endpoint:
-                if not placeholder_context.captured_record_id:
-                    record_id = extract_record_id_from_response(response.response_obj)
-                    if record_id:
-                        placeholder_context.set_record_id(record_id, "$ULID")
-        
-        # Sanitize curl command for documentation
-        sanitized_curl = sanitize_curl_for_documentation(
-            response.curl_command,
-            test_suite.serverURL,
-            test_suite.docURL,
-            auth_state,
-            placeholder_context.captured_record_id,
-            placeholder_context.placeholder_type
-        )
-        
-        # Only add to output if test has a name
-        if test.name:
-            markdown_lines.extend(format_markdown_result(
-                sanitized_curl,
-                response.status,
-                response.body,
-                test.name,
-                test.details,
-                test.notes
-            ))
-        
-        # Track overall success
-        if not is_successful:
-            all_tests_passed = False
-    
-    # Write output to file if specified
-    if output_file:
-        write_markdown_output(output_file, markdown_lines)
-    
+                    prepared[0]
+                )]
+            else:
+                if executor is None:
+                    executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
+                responses = list(executor.map(
+                    lambda t: execute_request(
+                        test_suite.serverURL,
+                        test_suite.prefix,
+                        t
+                    ),
+                    prepared
+                ))
+
+            for (test, _), test_copy, response in zip(batch, prepared, responses):
+                all_tests_passed = _process_test_response(
+                    test,
+                    test_copy,
+                    response,
+                    test_suite,
+                    auth_state,
+                    placeholder_context,
+                    markdown_lines,
+                    writer
+                ) and all_tests_passed
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if writer is not None:
+            writer.close()
+
     return TestResult(
         status="success" if all_tests_passed else "failure",
         output_file=output_file,
@@ -177,54 +187,225 @@ def run_test_suite(
     )
 
 
-def _test_needs_numbered_placeholders(test: TestDefinition) -> bool:
+def _prepare_test(
+    test: TestDefinition,
+    mask: int,
+    test_suite: TestSuite,
+    auth_state: AuthState,
+    placeholder_context: PlaceholderContext
+) -> TestDefinition:
     """
-    Check if a single test uses numbered placeholders like $ULID1, $ULID2.
-    
+    Copy a test and resolve all placeholders it needs before execution.
+
     Args:
-        test: Test definition
-        
+        test: Original test definition
+        mask: Placeholder bitmask from _scan_placeholders
+        test_suite: Test suite being executed
+        auth_state: Current authentication state
+        placeholder_context: Context with captured record ID(s)
+
     Returns:
-        True if numbered placeholders are found
+        Prepared copy of the test, ready to execute
     """
-    pattern = r'\$ULID\d+'
+    # Make a copy to avoid modifying the original
+    test_copy = _copy_test(test)
+
+    # Replace authentication placeholders first (needed for API calls)
+    if mask & (_PH_ACCESS_TOKEN | _PH_REFRESH_TOKEN):
+        replace_auth_placeholders(test_copy, auth_state)
+
+    # Check if this test needs fresh numbered placeholders
+    if mask & _PH_NUMBERED_ULID:
+        # Extract collection name from the test endpoint
+        collection_name = extract_collection_name(test_copy.endpoint)
+        if collection_name:
+            # Fetch fresh IDs from the collection (headers now have real tokens)
+            fresh_ids = _fetch_fresh_record_ids(
+                test_suite.serverURL,
+                test_suite.prefix,
+                collection_name,
+                test_copy.headers
+            )
+            if fresh_ids:
+                # Create a temporary context with fresh IDs
+                temp_context = PlaceholderContext()
+                temp_context.set_record_ids(fresh_ids)
+                replace_record_placeholders(test_copy, temp_context)
+
+    # Replace single record placeholders if we have a captured ID
+    elif (
+        mask & (_PH_ULID | _PH_NEXT_CURSOR)
+        and placeholder_context.captured_record_id
+    ):
+        placeholder_type = replace_record_placeholders(test_copy, placeholder_context)
+        if placeholder_type:
+            placeholder_context.placeholder_type = placeholder_type
+
+    return test_copy
+
+
+def _process_test_response(
+    test: TestDefinition,
+    test_copy: TestDefinition,
+    response: TestResponse,
+    test_suite: TestSuite,
+    auth_state: AuthState,
+    placeholder_context: PlaceholderContext,
+    markdown_lines: List[str],
+    writer: Optional[MarkdownStreamWriter] = None
+) -> bool:
+    """
+    Handle token/record capture, re-login and markdown output for one response.
+
+    Args:
+        test: Original test definition
+        test_copy: Prepared copy that was executed
+        response: Response from execute_request
+        test_suite: Test suite being executed
+        auth_state: Current authentication state (updated in-place)
+        placeholder_context: Context for captured record IDs (updated in-place)
+        markdown_lines: Markdown output accumulator (appended in-place)
+        writer: Output stream; when given, blocks are written to it instead
+            of being accumulated in markdown_lines
+
+    Returns:
+        True if the test passed
+    """
+    # Detect password change (data placeholders are already resolved)
+    new_password = detect_password_change(test_copy)
+
+    # Check for token refresh or login and update tokens
+    is_successful = response.status.startswith("2")
+    if is_successful and response.response_obj:
+        is_login = detect_login(test_copy)
+        is_refresh = detect_token_refresh(test_copy)
+        
+        if is_login or is_refresh:
+            access_token, refresh_token = extract_tokens_from_response(
+                response.response_obj
+            )
+            if access_token:
+                auth_state.update_access_token(access_token)
+            if refresh_token:
+                auth_state.update_refresh_token(refresh_token)
     
-    # Check endpoint
-    if test.endpoint and re.search(pattern, test.endpoint):
-        return True
+    # Handle password change: re-login with new password
+    if should_relogin_after_test(test_copy, response.status, new_password):
+        if new_password and auth_state.current_username:
+            new_auth_state = relogin_with_new_password(
+                test_suite.serverURL,
+                auth_state.current_username,
+                new_password
+            )
+            if new_auth_state:
+                # Update credentials and tokens
+                auth_state.update_credentials(
+                    auth_state.current_username,
+                    new_password
+                )
+                if new_auth_state.access_token:
+                    auth_state.update_access_token(new_auth_state.access_token)
+                if new_auth_state.refresh_token:
+                    auth_state.update_refresh_token(new_auth_state.refresh_token)
     
-    # Check data
-    if test.data:
-        import json
-        data_str = json.dumps(test.data)
-        if re.search(pattern, data_str):
-            return True
+    # Try to capture single record ID from successful create/list responses
+    if is_successful and response.response_obj:
+        endpoint = test_copy.endpoint
+        if ":create" in endpoint or ":list" in endpoint:
+            if not placeholder_context.captured_record_id:
+                record_id = extract_record_id_from_response(response.response_obj)
+                if record_id:
+                    placeholder_context.set_record_id(record_id, "$ULID")
     
-    return False
+    # Sanitize curl command for documentation
+    sanitized_curl = sanitize_curl_for_documentation(
+        response.curl_command,
+        test_suite.serverURL,
+        test_suite.docURL,
+        auth_state,
+        placeholder_context.captured_record_id,
+        placeholder_context.placeholder_type
+    )
+    
+    # Only add to output if test has a name
+    if test.name:
+        block = format_markdown_result(
+            sanitized_curl,
+            response.status,
+            response.body,
+            test.name,
+            test.details,
+            test.notes
+        )
+        if writer is not None:
+            writer.write_block(block)
+        else:
+            markdown_lines.append(block)
+
+    return is_successful
 
 
-def _extract_collection_name_from_test(test: TestDefinition) -> Optional[str]:
+def _is_batch_barrier(test: TestDefinition, mask: int) -> bool:
     """
-    Extract collection name from a test endpoint.
-    E.g., "/products:destroy" -> "products"
-    
+    Check if a test must not run concurrently with its neighbours.
+
+    Only side-effect-free GETs are safe to batch: any other command may
+    mutate server state that neighbouring tests observe (updates,
+    destroys, password changes), so it runs alone in declaration order.
+    A GET still forms a barrier when it consumes state captured by an
+    earlier test (record ID and refresh token placeholders, read from
+    the pre-scanned mask) or captures a record ID itself (:list).
+
     Args:
         test: Test definition
-        
+        mask: Placeholder bitmask from _scan_placeholders
+
     Returns:
-        Collection name or None
+        True if the test terminates a concurrent batch
     """
-    if not test.endpoint:
-        return None
-    
-    endpoint = test.endpoint.split('?')[0]  # Remove query params
-    parts = endpoint.split('/')
-    
-    for part in parts:
-        if ':' in part:
-            return part.split(':')[0]
-    
-    return None
+    if (test.cmd or "GET").upper() != "GET":
+        return True
+
+    if mask & (_PH_ULID | _PH_NUMBERED_ULID | _PH_NEXT_CURSOR | _PH_REFRESH_TOKEN):
+        return True
+
+    return ":list" in (test.endpoint or "")
+
+
+def _partition_into_batches(
+    tests: List[TestDefinition],
+    masks: List[int]
+) -> List[List[Tuple[TestDefinition, int]]]:
+    """
+    Split tests into ordered batches of concurrently runnable tests.
+
+    Consecutive independent tests are grouped into one batch; every
+    barrier test forms a single-test batch of its own, preserving the
+    original execution order across batches.
+
+    Args:
+        tests: Tests in declaration order
+        masks: Placeholder bitmask per test, parallel to tests
+
+    Returns:
+        List of batches of (test, mask) pairs in execution order
+    """
+    batches: List[List[Tuple[TestDefinition, int]]] = []
+    current: List[Tuple[TestDefinition, int]] = []
+
+    for test, mask in zip(tests, masks):
+        if _is_batch_barrier(test, mask):
+            if current:
+                batches.append(current)
+                current = []
+            batches.append([(test, mask)])
+        else:
+            current.append((test, mask))
+
+    if current:
+        batches.append(current)
+
+    return batches
 
 
 def _fetch_fresh_record_ids(
@@ -247,18 +428,14 @@ def _fetch_fresh_record_ids(
     Returns:
         List of fresh record IDs (may be empty)
     """
-    import requests
-    
     try:
         list_endpoint = f"/{collection_name}:list"
         url = f"{base_url}{prefix}{list_endpoint}"
-        
-        # Make request with timeout
-        resp = requests.get(url, headers=headers, timeout=10)
-        
-        if resp.status_code == 200:
-            data = resp.json()
-            
+
+        # Conditional GET: unchanged collections come from the ETag cache
+        data = get_json_with_etag(url, headers=headers, timeout=10)
+
+        if data is not None:
             # Try to find records in common response structures
             for array_key in ["data", "records", "items", "apikeys", "users"]:
                 records = data.get(array_key, [])
@@ -3,6 +3,8 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 
+from .jsonutil import json_dumps_pretty
+
 
 @dataclass
 class TestDefinition:
@@ -33,8 +35,24 @@ class TestResponse:
     """Represents the response from a single test execution."""
     curl_command: str
     status: str
-    body: str
     response_obj: Optional[Dict[str, Any]] = None
+    raw_body: Optional[str] = None
+    _body: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def body(self) -> str:
+        """
+        Display form of the response body, rendered on first access.
+
+        Pretty-printing the parsed JSON is deferred so unnamed tests,
+        whose output never reaches the markdown, skip the work entirely.
+        """
+        if self._body is None:
+            if self.response_obj is not None:
+                self._body = json_dumps_pretty(self.response_obj)
+            else:
+                self._body = self.raw_body or ""
+        return self._body
 
 
 @dataclass
@@ -46,17 +64,23 @@ class AuthState:
     current_password: Optional[str] = None
     all_access_tokens: List[str] = field(default_factory=list)
     all_refresh_tokens: List[str] = field(default_factory=list)
-    
+    # Set mirrors of the token lists for O(1) membership checks; the
+    # lists keep insertion order for the documentation redaction pass
+    _access_token_seen: set = field(default_factory=set, repr=False)
+    _refresh_token_seen: set = field(default_factory=set, repr=False)
+
     def update_access_token(self, token: str) -> None:
         """Update access token and track it for documentation replacement."""
         self.access_token = token
-        if token and token not in self.all_access_tokens:
+        if token and token not in self._access_token_seen:
+            self._access_token_seen.add(token)
             self.all_access_tokens.append(token)
-    
+
     def update_refresh_token(self, token: str) -> None:
         """Update refresh token and track it for documentation replacement."""
         self.refresh_token = token
-        if token and token not in self.all_refresh_tokens:
+        if token and token not in self._refresh_token_seen:
+            self._refresh_token_seen.add(token)
             self.all_refresh_tokens.append(token)
     
     def update_credentials(self, username: str, password: str) -> None:
@@ -87,5 +111,5 @@ class TestResult:
     """Aggregated result from test suite execution."""
     status: str  # 'success' or 'failure'
     output_file: Optional[str]
-    markdown: str
+    markdown: str  # empty when output was streamed to output_file
     all_tests_passed: bool